@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Convert the NLLB model to CTranslate2 format for Translator(backend='ct2')
+"""
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the NLLB model for the CTranslate2 backend')
+    parser.add_argument('--model', type=str, default='facebook/nllb-200-distilled-600M',
+                        help='HuggingFace model to convert (default: facebook/nllb-200-distilled-600M)')
+    parser.add_argument('--output-dir', type=str, default='models/nllb-200-distilled-600M-ct2',
+                        help='Directory to write the converted model to')
+    parser.add_argument('--quantization', type=str, default='int8_float16',
+                        help='Weight type stored in the converted model (default: int8_float16)')
+    parser.add_argument('--force', action='store_true',
+                        help='Overwrite an existing output directory')
+    args = parser.parse_args()
+
+    from ctranslate2.converters import TransformersConverter
+
+    print(f"Converting {args.model} -> {args.output_dir} ({args.quantization})")
+    TransformersConverter(args.model).convert(
+        args.output_dir, quantization=args.quantization, force=args.force
+    )
+    print("Done! 변환 완료")
+
+
+if __name__ == '__main__':
+    main()
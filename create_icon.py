@@ -3,40 +3,44 @@
 Create a simple translator app icon
 """
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+import numpy as np
 import os
 
+@lru_cache(maxsize=8)
+def _load_font(path, size):
+    """Load a TrueType font, reusing it across icon variants"""
+    return ImageFont.truetype(path, size)
+
 def create_gradient_circle(size=512):
     """Create a gradient circle icon"""
-    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
-
     # Colors matching the app theme
-    color1 = (102, 126, 234)  # #667eea
-    color2 = (118, 75, 162)   # #764ba2
+    color1 = np.array((102, 126, 234), dtype=np.float64)  # #667eea
+    color2 = np.array((118, 75, 162), dtype=np.float64)   # #764ba2
 
-    # Draw gradient circle
+    # Draw gradient circle in a single vectorized pass:
+    # color1 at the rim blending to color2 at the center
     center = size // 2
     radius = size // 2 - 20
 
-    for i in range(radius, 0, -1):
-        # Calculate gradient
-        ratio = (radius - i) / radius
-        r = int(color1[0] + (color2[0] - color1[0]) * ratio)
-        g = int(color1[1] + (color2[1] - color1[1]) * ratio)
-        b = int(color1[2] + (color2[2] - color1[2]) * ratio)
+    yy, xx = np.mgrid[:size, :size]
+    distance = np.hypot(xx - center, yy - center)
+    ratio = np.clip((radius - distance) / radius, 0.0, 1.0)[..., np.newaxis]
 
-        # Draw circle
-        draw.ellipse(
-            [center - i, center - i, center + i, center + i],
-            fill=(r, g, b, 255)
-        )
+    rgba = np.zeros((size, size, 4), dtype=np.uint8)
+    rgba[..., :3] = (color1 + (color2 - color1) * ratio).astype(np.uint8)
+    rgba[..., 3] = 255
+    rgba[distance > radius] = 0  # Transparent outside the circle
+
+    image = Image.fromarray(rgba, 'RGBA')
+    draw = ImageDraw.Draw(image)
 
     # Draw white "KO ⇄ EN" text
     try:
         font_size = size // 6
         # Try to use a nice font, fall back to default
         try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
+            font = _load_font("/System/Library/Fonts/Helvetica.ttc", font_size)
         except:
             font = ImageFont.load_default()
 
@@ -67,10 +71,12 @@ def main():
     icon.save('icons/icon.png')
     print("✓ Created icons/icon.png (512x512)")
 
-    # Create smaller sizes for different uses
-    sizes = [16, 32, 64, 128, 256]
+    # Create smaller sizes for different uses, halving the previous size each
+    # step (mipmap cascade) instead of resampling the 512px master every time
+    sizes = [256, 128, 64, 32, 16]
+    resized = icon
     for size in sizes:
-        resized = icon.resize((size, size), Image.Resampling.LANCZOS)
+        resized = resized.resize((size, size), Image.Resampling.LANCZOS)
         resized.save(f'icons/icon_{size}.png')
         print(f"✓ Created icons/icon_{size}.png")
 
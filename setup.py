@@ -8,14 +8,25 @@ APP = ['src/desktop/translator_app.py']
 DATA_FILES = []
 OPTIONS = {
     'argv_emulation': False,
+    # `packages` copies whole package trees, so it is kept for packages that
+    # ship native libraries/data files py2app cannot trace (torch, sentencepiece).
     'packages': [
-        'PyQt6',
-        'transformers',
         'torch',
         'sentencepiece',
     ],
+    # Everything else is pulled in module by module. transformers resolves
+    # model classes lazily, so the NLLB (M2M100) modules are listed explicitly.
     'includes': [
+        'PyQt6.QtWidgets',
+        'PyQt6.QtCore',
+        'PyQt6.QtGui',
+        'transformers.models.auto',
+        'transformers.models.m2m_100.configuration_m2m_100',
+        'transformers.models.m2m_100.modeling_m2m_100',
+        'transformers.models.nllb.tokenization_nllb',
+        'transformers.models.nllb.tokenization_nllb_fast',
         'src.translator',
+        'src.lang_detect',
     ],
     'excludes': [
         'matplotlib',
@@ -24,6 +35,16 @@ OPTIONS = {
         'pytest',
         'sphinx',
         'IPython',
+        'tensorflow',
+        'jax',
+        'flax',
+        'torchvision',
+        'torchaudio',
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.QtMultimedia',
+        'PyQt6.QtQml',
+        'PyQt6.QtQuick',
     ],
     'iconfile': 'icons/icon.icns',
     'plist': {
@@ -0,0 +1,25 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled script counter for src.lang_detect.
+
+Optional: build in place with `cythonize -i src/_langdetect.pyx`. Without
+the extension, lang_detect falls back to its NumPy/pure-Python counters.
+"""
+
+
+def count_scripts(str text):
+    """Count (Korean, Japanese, Chinese, non-whitespace) characters in a single C loop."""
+    cdef Py_ssize_t korean_chars = 0, japanese_chars = 0, chinese_chars = 0, total_chars = 0
+    cdef Py_UCS4 ch
+
+    for ch in text:
+        if ch <= 0x20:
+            continue
+        total_chars += 1
+        if 0xAC00 <= ch <= 0xD7A3:
+            korean_chars += 1
+        elif 0x3040 <= ch <= 0x30FF:
+            japanese_chars += 1
+        elif 0x4E00 <= ch <= 0x9FFF:
+            chinese_chars += 1
+    return korean_chars, japanese_chars, chinese_chars, total_chars
@@ -5,29 +5,27 @@ Supports Korean <-> English translation.
 """
 import argparse
 import sys
+import time
+from itertools import islice
 from pathlib import Path
-from src.translator import Translator
+from typing import TYPE_CHECKING, List
+from src.lang_detect import detect_language
 import logging
 
+# torch/transformers (and numba) take seconds to import, so they are loaded
+# only once they are actually needed; `--help` and argument errors stay instant.
+if TYPE_CHECKING:
+    from src.translator import Translator
+
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
-
-def detect_language(text: str) -> str:
-    """
-    Simple language detection based on character analysis.
-    Returns 'ko' for Korean, 'en' for English.
-    """
-    korean_chars = sum(1 for char in text if '\uac00' <= char <= '\ud7a3')
-    total_chars = len([char for char in text if char.strip()])
-
-    if total_chars == 0:
-        return 'en'
-
-    korean_ratio = korean_chars / total_chars
-
-    # If more than 30% Korean characters, consider it Korean
-    return 'ko' if korean_ratio > 0.3 else 'en'
+# Number of lines sent to the model per forward pass when translating files
+FILE_BATCH_SIZE = 16
+# Number of lines read from the input file (and held in memory) at a time
+FILE_CHUNK_LINES = 256
+# Minimum number of seconds between progress flushes to the terminal
+PROGRESS_FLUSH_INTERVAL = 0.1
 
 
 def print_header():
@@ -39,7 +37,7 @@ def print_header():
     print()
 
 
-def interactive_mode(translator: Translator):
+def interactive_mode(translator: 'Translator'):
     """
     Interactive translation mode.
 
@@ -103,7 +101,7 @@ def interactive_mode(translator: Translator):
             print()
 
 
-def translate_text(translator: Translator, text: str, src_lang: str, tgt_lang: str, auto_detect: bool):
+def translate_text(translator: 'Translator', text: str, src_lang: str, tgt_lang: str, auto_detect: bool):
     """
     Translate a single text.
 
@@ -125,11 +123,91 @@ def translate_text(translator: Translator, text: str, src_lang: str, tgt_lang: s
     print(result)
 
 
-def translate_file(translator: Translator, input_file: Path, output_file: Path,
+def _translate_line(translator: 'Translator', line_no: int, line: str, src_lang: str, tgt_lang: str) -> str:
+    """
+    Translate a single line, returning the original line on failure.
+
+    Args:
+        translator: Translator instance
+        line_no: 1-based line number (for error reporting)
+        line: Line to translate
+        src_lang: Source language
+        tgt_lang: Target language
+    """
+    try:
+        return translator.translate(line, src_lang=src_lang, tgt_lang=tgt_lang)
+    except Exception as e:
+        logger.error(f"라인 {line_no} 번역 실패 (Failed to translate line {line_no}): {e}")
+        return line
+
+
+def _translate_chunk(translator: 'Translator', lines: List[str], first_line_no: int,
+                     src_lang: str, tgt_lang: str, auto_detect: bool) -> List[str]:
+    """
+    Translate a chunk of lines, batching lines that share a translation direction.
+
+    Args:
+        translator: Translator instance
+        lines: Raw lines read from the input file
+        first_line_no: 1-based line number of the first line (for error reporting)
+        src_lang: Source language
+        tgt_lang: Target language
+        auto_detect: Whether to auto-detect language
+
+    Returns:
+        Translated lines in the same order as the input (empty lines stay empty)
+    """
+    # Keep non-empty lines together with their position in the chunk
+    translated_lines = [""] * len(lines)
+    entries = [(i, line.strip()) for i, line in enumerate(lines)]
+    entries = [(i, line) for i, line in entries if line]
+
+    # Group lines by translation direction; with explicit languages there is
+    # only one group and detection is skipped entirely
+    if auto_detect:
+        groups = {}
+        for i, line in entries:
+            if detect_language(line) == 'ko':
+                direction = ('ko', 'en')
+            else:
+                direction = ('en', 'ko')
+            groups.setdefault(direction, []).append((i, line))
+    else:
+        groups = {(src_lang, tgt_lang): entries}
+
+    # Translate each direction in batches and scatter results back in order
+    for (current_src, current_tgt), items in groups.items():
+        for start in range(0, len(items), FILE_BATCH_SIZE):
+            batch = items[start:start + FILE_BATCH_SIZE]
+            try:
+                results = translator.translate_batch(
+                    [line for _, line in batch],
+                    src_lang=current_src,
+                    tgt_lang=current_tgt,
+                    batch_size=FILE_BATCH_SIZE
+                )
+            except Exception as e:
+                logger.error(f"배치 번역 실패, 라인별 재시도 (Batch translation failed, retrying per line): {e}")
+                results = [
+                    _translate_line(translator, first_line_no + i, line, current_src, current_tgt)
+                    for i, line in batch
+                ]
+
+            for (i, _), result in zip(batch, results):
+                translated_lines[i] = result
+
+    return translated_lines
+
+
+def translate_file(translator: 'Translator', input_file: Path, output_file: Path,
                    src_lang: str, tgt_lang: str, auto_detect: bool):
     """
     Translate contents of a file.
 
+    The input is streamed in chunks of FILE_CHUNK_LINES lines and each chunk is
+    written to the output as soon as it is translated, so memory use stays
+    bounded regardless of file size.
+
     Args:
         translator: Translator instance
         input_file: Input file path
@@ -141,40 +219,41 @@ def translate_file(translator: Translator, input_file: Path, output_file: Path,
     if not input_file.exists():
         logger.error(f"입력 파일을 찾을 수 없습니다 (Input file not found): {input_file}")
         sys.exit(1)
+    # Output is written while the input is still being read; opening the input
+    # itself for writing would truncate it before the first line is translated
+    if output_file.exists() and input_file.samefile(output_file):
+        logger.error(f"출력 파일이 입력 파일과 같습니다 (Output file is the input file): {output_file}")
+        sys.exit(1)
 
-    # Read input file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    logger.info(f"번역 중... (Translating {len(lines)} lines)")
-
-    translated_lines = []
-    for i, line in enumerate(lines, 1):
-        line = line.strip()
-        if not line:
-            translated_lines.append("")
-            continue
-
-        if auto_detect:
-            detected_lang = detect_language(line)
-            if detected_lang == 'ko':
-                current_src, current_tgt = 'ko', 'en'
-            else:
-                current_src, current_tgt = 'en', 'ko'
-        else:
-            current_src, current_tgt = src_lang, tgt_lang
-
-        try:
-            result = translator.translate(line, src_lang=current_src, tgt_lang=current_tgt)
-            translated_lines.append(result)
-            print(f"  [{i}/{len(lines)}] 완료 (Completed)", end='\r')
-        except Exception as e:
-            logger.error(f"라인 {i} 번역 실패 (Failed to translate line {i}): {e}")
-            translated_lines.append(line)
+    logger.info(f"번역 중... (Translating {input_file})")
+
+    completed = 0
+    chunk_no = 0
+    last_flush = time.monotonic()
+    # Lines are joined with '\n' and the file has no trailing newline, as when
+    # the whole file was translated at once
+    separator = ''
+    with open(input_file, 'r', encoding='utf-8') as f_in, \
+            open(output_file, 'w', encoding='utf-8') as f_out:
+        while True:
+            lines = list(islice(f_in, FILE_CHUNK_LINES))
+            if not lines:
+                break
 
-    # Write output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(translated_lines))
+            for result in _translate_chunk(translator, lines, completed + 1,
+                                           src_lang, tgt_lang, auto_detect):
+                f_out.write(separator + result)
+                separator = '\n'
+
+            # Progress is reported once per chunk rather than once per line, and
+            # stdout is flushed at most every PROGRESS_FLUSH_INTERVAL seconds
+            completed += len(lines)
+            chunk_no += 1
+            sys.stdout.write(f"  [chunk {chunk_no}] {completed} 라인 완료 (Lines completed)\r")
+            now = time.monotonic()
+            if now - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                sys.stdout.flush()
+                last_flush = now
 
     print()  # New line after progress
     logger.info(f"번역 완료! 결과 저장됨 (Translation complete! Saved to): {output_file}")
@@ -270,7 +349,10 @@ def main():
         else:
             print("번역기 초기화 중... (Initializing translator...)")
 
-        translator = Translator(use_gpu=not args.no_gpu)
+        from src.translator import Translator
+        # Warmup only pays off in a long-lived session; one-shot -t/-f runs
+        # would spend more time on it than on the actual translation
+        translator = Translator(use_gpu=not args.no_gpu, warmup=is_interactive)
 
         if not is_interactive:
             logger.info("번역기 준비 완료! (Translator ready!)")
@@ -14,100 +14,149 @@ from PyQt6.QtWidgets import (
     QTextEdit, QPushButton, QLabel, QCheckBox, QSplitter,
     QStatusBar, QMessageBox, QGroupBox, QComboBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, pyqtSlot, QTimer
 from PyQt6.QtGui import QFont, QIcon, QTextCursor
 
-from src.translator import Translator
+from src.lang_detect import detect_cjk_language, warmup as warmup_lang_detect
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Delay before refreshing the character count after the last edit
+CHAR_COUNT_DEBOUNCE_MS = 100
+
+# Accent colors of the source and target language badges
+SOURCE_ACCENT = '#667eea'
+TARGET_ACCENT = '#764ba2'
+
+# Stylesheets shared by both language badges and selectors; {accent} is the panel color
+_LANG_LABEL_STYLE = """
+    QLabel {{
+        background-color: {accent};
+        color: white;
+        padding: 5px 15px;
+        border-radius: 12px;
+        font-weight: bold;
+    }}
+"""
+
+_LANG_COMBO_STYLE = """
+    QComboBox {{
+        background-color: {accent};
+        color: white;
+        padding: 5px 15px;
+        border-radius: 12px;
+        font-weight: bold;
+        min-width: 150px;
+    }}
+    QComboBox::drop-down {{
+        border: none;
+    }}
+    QComboBox::down-arrow {{
+        image: none;
+        border: none;
+    }}
+    QComboBox QAbstractItemView {{
+        background-color: white;
+        color: #212529;
+        border: 1px solid #dee2e6;
+        selection-background-color: {accent};
+        selection-color: white;
+        outline: none;
+    }}
+    QComboBox QAbstractItemView::item {{
+        background-color: white;
+        color: #212529;
+        padding: 5px;
+        min-height: 25px;
+    }}
+    QComboBox QAbstractItemView::item:selected {{
+        background-color: {accent};
+        color: white;
+    }}
+    QComboBox QAbstractItemView::item:hover {{
+        background-color: #e8ebfd;
+        color: #212529;
+    }}
+"""
+
 
-class TranslationWorker(QThread):
-    """Worker thread for translation to prevent UI freezing"""
+class ModelLoader(QThread):
+    """One-shot thread that loads and warms up the translation model off the UI thread"""
+    model_ready = pyqtSignal(object)  # Translator instance
+    error = pyqtSignal(str)
+
+    def run(self):
+        try:
+            # torch/transformers are imported here so the window paints immediately
+            # (Translator sizes the CPU thread pools itself)
+            import torch
+            torch.set_float32_matmul_precision('high')
+            torch.backends.mkldnn.enabled = True
+
+            from src.translator import Translator
+            # The constructor warms the model up, so the first real translation is fast
+            translator = Translator(use_gpu=False, quantization='int8')
+            warmup_lang_detect()
+
+            self.model_ready.emit(translator)
+
+        except Exception as e:
+            logger.error(f"Failed to initialize translator: {e}")
+            self.error.emit(str(e))
+
+
+def resolve_languages(text, src_lang, tgt_lang, auto_detect):
+    """Return the (src_lang, tgt_lang) pair to translate text with"""
+    if not auto_detect:
+        return src_lang, tgt_lang
+
+    detected_lang = detect_cjk_language(text)
+    # Default target language is English for all Asian languages
+    # Korean ↔ English (bidirectional)
+    # Japanese → English
+    # Chinese → English
+    # English → Korean (default)
+    if detected_lang == 'ko':
+        return 'ko', 'en'
+    elif detected_lang in ['ja', 'zh']:
+        return detected_lang, 'en'
+    else:  # English or other
+        return 'en', 'ko'
+
+
+class TranslationWorker(QObject):
+    """Runs translation jobs on the thread it is moved to, keeping the UI responsive"""
     finished = pyqtSignal(str, str, str)  # translation, src_lang, tgt_lang
     error = pyqtSignal(str)
 
-    def __init__(self, translator, text, src_lang, tgt_lang, auto_detect):
+    def __init__(self, translator):
         super().__init__()
         self.translator = translator
-        self.text = text
-        self.src_lang = src_lang
-        self.tgt_lang = tgt_lang
-        self.auto_detect = auto_detect
 
-    def run(self):
+    @pyqtSlot(str, str, str, bool)
+    def do_translate(self, text, src_lang, tgt_lang, auto_detect):
+        """Translate one request; invoked through a queued connection"""
         try:
             # Auto-detect language if enabled
-            if self.auto_detect:
-                detected_lang = self.detect_language(self.text)
-                # Default target language is English for all Asian languages
-                # Korean ↔ English (bidirectional)
-                # Japanese → English
-                # Chinese → English
-                # English → Korean (default)
-                if detected_lang == 'ko':
-                    self.src_lang, self.tgt_lang = 'ko', 'en'
-                elif detected_lang in ['ja', 'zh']:
-                    self.src_lang, self.tgt_lang = detected_lang, 'en'
-                else:  # English or other
-                    self.src_lang, self.tgt_lang = 'en', 'ko'
+            src_lang, tgt_lang = resolve_languages(text, src_lang, tgt_lang, auto_detect)
 
             # Perform translation
             result = self.translator.translate(
-                self.text,
-                src_lang=self.src_lang,
-                tgt_lang=self.tgt_lang
+                text,
+                src_lang=src_lang,
+                tgt_lang=tgt_lang
             )
 
-            self.finished.emit(result, self.src_lang, self.tgt_lang)
+            self.finished.emit(result, src_lang, tgt_lang)
 
         except Exception as e:
-            logger.error(f"Translation error: {e}", exc_info=True)
+            # Tracebacks are only collected when debug logging is on
+            logger.error('Translation error: %s', e)
+            logger.debug('Translation error traceback', exc_info=True)
             self.error.emit(str(e))
 
-    @staticmethod
-    def detect_language(text: str) -> str:
-        """
-        Enhanced language detection for Korean, Japanese, Chinese, and English
-        Returns: language code ('ko', 'ja', 'zh', or 'en')
-        """
-        if not text or not text.strip():
-            return 'en'
-
-        # Count characters for each language
-        korean_chars = sum(1 for char in text if '\uac00' <= char <= '\ud7a3')
-
-        # Japanese: Hiragana, Katakana, and some Kanji
-        hiragana = sum(1 for char in text if '\u3040' <= char <= '\u309f')
-        katakana = sum(1 for char in text if '\u30a0' <= char <= '\u30ff')
-        japanese_chars = hiragana + katakana
-
-        # Chinese: CJK Unified Ideographs (common Chinese characters)
-        chinese_chars = sum(1 for char in text if '\u4e00' <= char <= '\u9fff')
-
-        # Total non-whitespace characters
-        total_chars = len([char for char in text if char.strip()])
-
-        if total_chars == 0:
-            return 'en'
-
-        # Calculate ratios
-        korean_ratio = korean_chars / total_chars
-        japanese_ratio = japanese_chars / total_chars
-        chinese_ratio = chinese_chars / total_chars
-
-        # Determine language (threshold: 20%)
-        if korean_ratio > 0.2:
-            return 'ko'
-        elif japanese_ratio > 0.2:
-            return 'ja'
-        elif chinese_ratio > 0.2:
-            return 'zh'
-        else:
-            return 'en'
-
 
 class TranslatorApp(QMainWindow):
     """Main application window"""
@@ -119,13 +168,27 @@ class TranslatorApp(QMainWindow):
         'ja': '日本語 (Japanese)',
         'zh': '中文 (Chinese)'
     }
+    # Both combo boxes are filled in LANGUAGES order, so a code's position is its index
+    _LANG_CODES = tuple(LANGUAGES)
+    _LANG_INDEX = {code: i for i, code in enumerate(_LANG_CODES)}
+
+    # Delivers jobs to the worker; the connection is queued across threads
+    translation_requested = pyqtSignal(str, str, str, bool)  # text, src_lang, tgt_lang, auto_detect
 
     def __init__(self):
         super().__init__()
         self.translator = None
+        # Single translation worker and its thread, started once the model is loaded
         self.worker = None
+        self._worker_thread = None
+        self._loader = None
         self.current_src_lang = 'en'
         self.current_tgt_lang = 'ko'
+        # Hash of the request currently shown in the target panel (and of the one in flight)
+        self._last_translated_hash = None
+        self._pending_hash = None
+        # Text shown in the (read-only) target panel, or None if it must be read back
+        self._last_translation = ''
 
         self.init_ui()
         self.init_translator()
@@ -201,15 +264,7 @@ class TranslatorApp(QMainWindow):
 
         # Language label (shown when auto-detect is on)
         self.source_lang_label = QLabel('Auto-detect')
-        self.source_lang_label.setStyleSheet("""
-            QLabel {
-                background-color: #667eea;
-                color: white;
-                padding: 5px 15px;
-                border-radius: 12px;
-                font-weight: bold;
-            }
-        """)
+        self.source_lang_label.setStyleSheet(_LANG_LABEL_STYLE.format(accent=SOURCE_ACCENT))
 
         # Language selector (shown when auto-detect is off)
         self.source_lang_combo = QComboBox()
@@ -218,51 +273,19 @@ class TranslatorApp(QMainWindow):
         self.source_lang_combo.setCurrentText(self.LANGUAGES['en'])
         self.source_lang_combo.currentIndexChanged.connect(self.on_source_lang_changed)
         self.source_lang_combo.setVisible(False)
-        self.source_lang_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #667eea;
-                color: white;
-                padding: 5px 15px;
-                border-radius: 12px;
-                font-weight: bold;
-                min-width: 150px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                color: #212529;
-                border: 1px solid #dee2e6;
-                selection-background-color: #667eea;
-                selection-color: white;
-                outline: none;
-            }
-            QComboBox QAbstractItemView::item {
-                background-color: white;
-                color: #212529;
-                padding: 5px;
-                min-height: 25px;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background-color: #667eea;
-                color: white;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                background-color: #e8ebfd;
-                color: #212529;
-            }
-        """)
+        self.source_lang_combo.setStyleSheet(_LANG_COMBO_STYLE.format(accent=SOURCE_ACCENT))
 
         # Text edit
         self.source_text = QTextEdit()
         self.source_text.setPlaceholderText('번역할 텍스트를 입력하세요...\nEnter text to translate...')
         self.source_text.setFont(QFont('Arial', 12))
-        self.source_text.textChanged.connect(self.update_char_count)
+
+        # Coalesce bursts of textChanged (typing, large pastes) into one label update
+        self._char_count_timer = QTimer(self)
+        self._char_count_timer.setSingleShot(True)
+        self._char_count_timer.setInterval(CHAR_COUNT_DEBOUNCE_MS)
+        self._char_count_timer.timeout.connect(self.update_char_count)
+        self.source_text.textChanged.connect(self._char_count_timer.start)
 
         # Character count
         self.char_count_label = QLabel('0 characters')
@@ -294,15 +317,7 @@ class TranslatorApp(QMainWindow):
 
         # Language label (shown when auto-detect is on)
         self.target_lang_label = QLabel('-')
-        self.target_lang_label.setStyleSheet("""
-            QLabel {
-                background-color: #764ba2;
-                color: white;
-                padding: 5px 15px;
-                border-radius: 12px;
-                font-weight: bold;
-            }
-        """)
+        self.target_lang_label.setStyleSheet(_LANG_LABEL_STYLE.format(accent=TARGET_ACCENT))
 
         # Language selector (shown when auto-detect is off)
         self.target_lang_combo = QComboBox()
@@ -311,45 +326,7 @@ class TranslatorApp(QMainWindow):
         self.target_lang_combo.setCurrentText(self.LANGUAGES['ko'])
         self.target_lang_combo.currentIndexChanged.connect(self.on_target_lang_changed)
         self.target_lang_combo.setVisible(False)
-        self.target_lang_combo.setStyleSheet("""
-            QComboBox {
-                background-color: #764ba2;
-                color: white;
-                padding: 5px 15px;
-                border-radius: 12px;
-                font-weight: bold;
-                min-width: 150px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                color: #212529;
-                border: 1px solid #dee2e6;
-                selection-background-color: #764ba2;
-                selection-color: white;
-                outline: none;
-            }
-            QComboBox QAbstractItemView::item {
-                background-color: white;
-                color: #212529;
-                padding: 5px;
-                min-height: 25px;
-            }
-            QComboBox QAbstractItemView::item:selected {
-                background-color: #764ba2;
-                color: white;
-            }
-            QComboBox QAbstractItemView::item:hover {
-                background-color: #e8ebfd;
-                color: #212529;
-            }
-        """)
+        self.target_lang_combo.setStyleSheet(_LANG_COMBO_STYLE.format(accent=TARGET_ACCENT))
 
         # Text edit
         self.target_text = QTextEdit()
@@ -488,20 +465,36 @@ class TranslatorApp(QMainWindow):
 
     def init_translator(self):
         """Initialize translator in background"""
-        QTimer.singleShot(100, self._load_translator)
+        self.status_bar.showMessage('Loading translation model... This may take a minute.')
+        # The UI stays responsive while loading; Translate is enabled once the model is ready
+        self.translate_btn.setEnabled(False)
+        self._loader = ModelLoader()
+        self._loader.model_ready.connect(self._load_translator)
+        self._loader.error.connect(self._on_translator_error)
+        self._loader.start()
 
-    def _load_translator(self):
-        """Load translator model"""
-        try:
-            self.status_bar.showMessage('Loading translation model... This may take a minute.')
-            self.translator = Translator(use_gpu=False)
-            self.status_bar.showMessage('Ready! 번역 준비 완료', 3000)
-            self.translate_btn.setEnabled(True)
-            logger.info("Translator initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize translator: {e}")
-            self.status_bar.showMessage(f'Error: {e}')
-            self._show_message_box('Error', f'Failed to load translator:\n{e}', QMessageBox.Icon.Critical)
+    def _load_translator(self, translator):
+        """Install the translator loaded by ModelLoader"""
+        self.translator = translator
+
+        # One persistent worker thread serves every translation request
+        self._worker_thread = QThread(self)
+        self.worker = TranslationWorker(translator)
+        self.worker.moveToThread(self._worker_thread)
+        self.translation_requested.connect(self.worker.do_translate)
+        self.worker.finished.connect(self.on_translation_finished)
+        self.worker.error.connect(self.on_translation_error)
+        self._worker_thread.finished.connect(self.worker.deleteLater)
+        self._worker_thread.start()
+
+        self.status_bar.showMessage('Ready! 번역 준비 완료', 3000)
+        self.translate_btn.setEnabled(True)
+        logger.info("Translator initialized successfully")
+
+    def _on_translator_error(self, error_msg):
+        """Handle translator loading failure"""
+        self.status_bar.showMessage(f'Error: {error_msg}')
+        self._show_message_box('Error', f'Failed to load translator:\n{error_msg}', QMessageBox.Icon.Critical)
 
     def translate(self):
         """Perform translation"""
@@ -515,26 +508,47 @@ class TranslatorApp(QMainWindow):
             self._show_message_box('Warning', 'Translator is not ready yet.', QMessageBox.Icon.Warning)
             return
 
+        # Skip the model entirely if this exact request is already displayed
+        request_hash = self._translation_hash(text)
+        if request_hash == self._last_translated_hash and not self.target_text.document().isEmpty():
+            self.status_bar.showMessage('Already translated! 이미 번역됨', 2000)
+            return
+        self._pending_hash = request_hash
+
+        # Previously translated requests are answered from the translator's
+        # cache without starting a worker (detection is cheap and memoized)
+        src_lang, tgt_lang = resolve_languages(
+            text, self.current_src_lang, self.current_tgt_lang, self.auto_detect_cb.isChecked()
+        )
+        cached = self.translator.get_cached(text, src_lang=src_lang, tgt_lang=tgt_lang)
+        if cached is not None:
+            self.on_translation_finished(cached, src_lang, tgt_lang)
+            return
+
         # Disable button and show progress
         self.translate_btn.setEnabled(False)
         self.translate_btn.setText('번역 중... (Translating...)')
         self.status_bar.showMessage('Translating...')
 
-        # Start translation in worker thread
-        self.worker = TranslationWorker(
-            self.translator,
+        # Hand the job to the translation thread
+        self.translation_requested.emit(
             text,
             self.current_src_lang,
             self.current_tgt_lang,
             self.auto_detect_cb.isChecked()
         )
-        self.worker.finished.connect(self.on_translation_finished)
-        self.worker.error.connect(self.on_translation_error)
-        self.worker.start()
+
+    def _translation_hash(self, text):
+        """Hash identifying a translation request (text plus language settings)"""
+        if self.auto_detect_cb.isChecked():
+            return hash((text, True))
+        return hash((text, False, self.current_src_lang, self.current_tgt_lang))
 
     def on_translation_finished(self, translation, src_lang, tgt_lang):
         """Handle translation completion"""
         self.target_text.setPlainText(translation)
+        self._last_translation = translation
+        self._last_translated_hash = self._pending_hash
 
         # Language names mapping
         lang_names = {
@@ -571,12 +585,17 @@ class TranslatorApp(QMainWindow):
         """Clear all text"""
         self.source_text.clear()
         self.target_text.clear()
+        self._last_translated_hash = None
+        self._last_translation = ''
         self.source_lang_label.setText('Auto-detect')
         self.target_lang_label.setText('-')
 
     def copy_translation(self):
         """Copy translation to clipboard"""
-        text = self.target_text.toPlainText()
+        # Reuse the model output instead of serializing the document again
+        text = self._last_translation
+        if text is None:
+            text = self.target_text.toPlainText()
         if text:
             clipboard = QApplication.clipboard()
             clipboard.setText(text)
@@ -586,18 +605,26 @@ class TranslatorApp(QMainWindow):
 
     def swap_text(self):
         """Swap source and target text"""
-        source = self.source_text.toPlainText()
-        target = self.target_text.toPlainText()
-
-        self.source_text.setPlainText(target)
-        self.target_text.setPlainText(source)
+        # Swap cloned documents instead of round-tripping both texts through
+        # Python strings; each clone is parented to the editor that will own it
+        source_doc = self.source_text.document().clone(self.target_text)
+        target_doc = self.target_text.document().clone(self.source_text)
+
+        self.source_text.setDocument(target_doc)
+        self.target_text.setDocument(source_doc)
+        self._char_count_timer.start()
+        self._last_translated_hash = None
+        # The target panel now holds the old source text
+        self._last_translation = None
 
         # Swap languages
         self.current_src_lang, self.current_tgt_lang = self.current_tgt_lang, self.current_src_lang
 
     def update_char_count(self):
         """Update character count"""
-        count = len(self.source_text.toPlainText())
+        # characterCount() is maintained by the document and includes the final
+        # paragraph separator, so there is no need to serialize the text
+        count = self.source_text.document().characterCount() - 1
         self.char_count_label.setText(f'{count} characters')
 
     def on_auto_detect_changed(self, state):
@@ -630,11 +657,10 @@ class TranslatorApp(QMainWindow):
         # Prevent same language selection
         if src_code == tgt_code:
             # Find a different target language
-            for code in self.LANGUAGES.keys():
+            for code in self._LANG_CODES:
                 if code != src_code:
                     # Set target to a different language
-                    idx = self.target_lang_combo.findData(code)
-                    self.target_lang_combo.setCurrentIndex(idx)
+                    self.target_lang_combo.setCurrentIndex(self._LANG_INDEX[code])
                     tgt_code = code
                     break
 
@@ -649,11 +675,10 @@ class TranslatorApp(QMainWindow):
         # Prevent same language selection
         if src_code == tgt_code:
             # Find a different source language
-            for code in self.LANGUAGES.keys():
+            for code in self._LANG_CODES:
                 if code != tgt_code:
                     # Set source to a different language
-                    idx = self.source_lang_combo.findData(code)
-                    self.source_lang_combo.setCurrentIndex(idx)
+                    self.source_lang_combo.setCurrentIndex(self._LANG_INDEX[code])
                     src_code = code
                     break
 
@@ -728,6 +753,16 @@ class TranslatorApp(QMainWindow):
         reply = msg_box.exec()
 
         if reply == QMessageBox.StandardButton.Yes:
+            # A QThread destroyed while running aborts the process; model loading
+            # cannot be interrupted, so drop its result and let it finish
+            if self._loader is not None and self._loader.isRunning():
+                self._loader.model_ready.disconnect()
+                self._loader.error.disconnect()
+                self.status_bar.showMessage('Waiting for model loading to finish...')
+                self._loader.wait()
+            if self._worker_thread is not None:
+                self._worker_thread.quit()
+                self._worker_thread.wait()
             event.accept()
         else:
             event.ignore()
@@ -0,0 +1,314 @@
+"""
+Script-based language detection shared by the CLI, web UI and desktop app.
+
+Languages are told apart by counting characters in their Unicode blocks:
+Hangul syllables (Korean), Hiragana/Katakana (Japanese) and CJK Unified
+Ideographs (Chinese). Anything else is treated as English.
+"""
+import re
+from functools import lru_cache, wraps
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional here; counting falls back to pure Python
+    np = None
+
+try:
+    # Optional Cython build of the counting loop (see src/_langdetect.pyx)
+    from src._langdetect import count_scripts as _count_scripts_compiled
+except ImportError:
+    _count_scripts_compiled = None
+
+# Unicode ranges used for language detection. Plain ints compare against
+# uint32 arrays without upcasting them.
+_HANGUL_START, _HANGUL_END = 0xAC00, 0xD7A3        # Hangul syllables
+_HIRAGANA_START, _KATAKANA_END = 0x3040, 0x30FF    # Hiragana + Katakana
+_CJK_START, _CJK_END = 0x4E00, 0x9FFF              # CJK Unified Ideographs
+# Codepoints at or below space are treated as whitespace/control characters
+_SPACE = 0x20
+
+# Shorter inputs are counted with precompiled regexes, which run in C without
+# the encode/frombuffer/ufunc setup that only pays off on longer text
+_VECTORIZE_MIN_CHARS = 64
+# The four-bucket CJK count needs four mask passes, so the pure-Python single
+# pass stays faster for longer (crossover measured around 100 characters)
+_CJK_VECTORIZE_MIN_CHARS = 128
+_HANGUL_RE = re.compile(r'[\uac00-\ud7a3]')
+_NONSPACE_RE = re.compile(r'[^\x00-\x20]')
+# Any character of the three scripts; texts without one are English outright
+_CJK_SCRIPT_RE = re.compile(r'[\u3040-\u30ff\u4e00-\u9fff\uac00-\ud7a3]')
+
+# From this length on, texts too short for NumPy (or all texts, without NumPy)
+# are counted on their UTF-8 bytes.
+# Every codepoint in the ranges above encodes to three bytes, and lead bytes
+# never collide with continuation bytes, so bytes.count() on a lead byte
+# counts characters exactly. Blocks that share a lead byte with other
+# characters are matched on their first two or three bytes.
+_UTF8_SCAN_MIN_CHARS = 32
+_HANGUL_LEAD_BYTES = (b'\xeb', b'\xec')  # U+B000-CFFF
+_HANGUL_EDGE_RE = re.compile(rb'\xea[\xb0-\xbf]|\xed[\x80-\x9d]|\xed\x9e[\x80-\xa3]')
+_KANA_RE = re.compile(rb'\xe3[\x81-\x83]')  # U+3040-30FF
+_CJK_LEAD_BYTES = (b'\xe5', b'\xe6', b'\xe7', b'\xe8', b'\xe9')  # U+5000-9FFF
+_CJK_EDGE_RE = re.compile(rb'\xe4[\xb8-\xbf]')  # U+4E00-4FFF
+# Whitespace/control bytes; each is a whole character in UTF-8
+_SPACE_BYTES = bytes(range(_SPACE + 1))
+
+# Ratios above which a text is classified as Korean (detect_language) or as
+# Korean/Japanese/Chinese (detect_cjk_language)
+_KO_THRESHOLD = 0.3
+_CJK_THRESHOLD = 0.2
+
+# The compiled long-text loops check every this many characters whether the Korean count
+# already exceeds the threshold for the whole text, which fixes the answer
+_EARLY_EXIT_STRIDE = 256
+
+# Results for inputs up to this length are memoized (retries, repeated lines)
+_CACHEABLE_MAX_CHARS = 256
+# Longer texts get a few slots of their own, enough for re-clicking Translate
+# on the same pasted document without keeping many large strings alive
+_LONG_CACHE_SIZE = 16
+
+
+def _memoize_inputs(func):
+    """Memoize a detector, with separate caches for short and long inputs."""
+    short_cached = lru_cache(maxsize=1024)(func)
+    long_cached = lru_cache(maxsize=_LONG_CACHE_SIZE)(func)
+
+    @wraps(func)
+    def wrapper(text: str) -> str:
+        if len(text) <= _CACHEABLE_MAX_CHARS:
+            return short_cached(text)
+        return long_cached(text)
+
+    def cache_clear():
+        short_cached.cache_clear()
+        long_cached.cache_clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def _to_codepoints(text: str) -> 'np.ndarray':
+    """View text as a uint32 array of Unicode codepoints."""
+    # Lone surrogates (e.g. from broken JSON escapes) are kept as their codepoints
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def _ko_ratio_numpy(codepoints: 'np.ndarray') -> float:
+    """Ratio of Hangul syllables to non-whitespace codepoints (vectorized)."""
+    korean_chars = np.count_nonzero((codepoints >= _HANGUL_START) & (codepoints <= _HANGUL_END))
+    total_chars = np.count_nonzero(codepoints > _SPACE)
+    return korean_chars / total_chars if total_chars else 0.0
+
+
+def _ko_ratio_loop(codepoints: 'np.ndarray') -> float:
+    """Ratio of Hangul syllables to non-whitespace codepoints (single pass, for Numba)."""
+    korean_chars = 0
+    total_chars = 0
+    # len() bounds the final total, so beyond this count the text is Korean
+    decided_at = _KO_THRESHOLD * len(codepoints)
+    for i in range(len(codepoints)):
+        if i % _EARLY_EXIT_STRIDE == 0 and korean_chars > decided_at:
+            break
+        c = codepoints[i]
+        if c > 0x20:
+            total_chars += 1
+            if 0xAC00 <= c <= 0xD7A3:
+                korean_chars += 1
+    return korean_chars / total_chars if total_chars > 0 else 0.0
+
+
+def _count_hangul_utf8(data: bytes) -> int:
+    """Count Hangul syllables in UTF-8 encoded text."""
+    count = data.count
+    return sum(count(lead) for lead in _HANGUL_LEAD_BYTES) + len(_HANGUL_EDGE_RE.findall(data))
+
+
+def _count_nonspace_utf8(text: str, data: bytes) -> int:
+    """Count non-whitespace characters of text given its UTF-8 encoding."""
+    return len(text) - (len(data) - len(data.translate(None, _SPACE_BYTES)))
+
+
+def _ko_ratio_utf8(text: str) -> float:
+    """
+    Ratio of Hangul syllables to non-whitespace characters without NumPy.
+
+    Scans the UTF-8 bytes with bytes.count()/translate() and a lead-byte regex,
+    all of which run in C instead of visiting each character in Python.
+    """
+    data = text.encode('utf-8', 'surrogatepass')
+    korean_chars = _count_hangul_utf8(data)
+    total_chars = _count_nonspace_utf8(text, data)
+    return korean_chars / total_chars if total_chars else 0.0
+
+
+def _count_scripts_utf8(text: str) -> tuple:
+    """Count (Korean, Japanese, Chinese, non-whitespace) characters from UTF-8 bytes."""
+    data = text.encode('utf-8', 'surrogatepass')
+    count = data.count
+    korean_chars = _count_hangul_utf8(data)
+    japanese_chars = len(_KANA_RE.findall(data))
+    chinese_chars = sum(count(lead) for lead in _CJK_LEAD_BYTES) + len(_CJK_EDGE_RE.findall(data))
+    total_chars = _count_nonspace_utf8(text, data)
+    return korean_chars, japanese_chars, chinese_chars, total_chars
+
+
+def _count_scripts_python(text: str) -> tuple:
+    """
+    Count (Korean, Japanese, Chinese, non-whitespace) characters in a single pass.
+
+    Each character is converted with ord() once and bucketed with integer
+    comparisons; the buckets are disjoint, so at most one range check matches.
+    Used for very short texts, where encoding to UTF-8 costs more than it saves.
+    """
+    korean_chars = japanese_chars = chinese_chars = total_chars = 0
+    for ch in text:
+        cp = ord(ch)
+        if cp <= _SPACE:
+            continue
+        total_chars += 1
+        if _HANGUL_START <= cp <= _HANGUL_END:
+            korean_chars += 1
+        elif _HIRAGANA_START <= cp <= _KATAKANA_END:
+            japanese_chars += 1
+        elif _CJK_START <= cp <= _CJK_END:
+            chinese_chars += 1
+    return korean_chars, japanese_chars, chinese_chars, total_chars
+
+
+def _count_scripts_numpy(codepoints: 'np.ndarray') -> tuple:
+    """Count (Korean, Japanese, Chinese, non-whitespace) codepoints (vectorized)."""
+    korean_chars = np.count_nonzero((codepoints >= _HANGUL_START) & (codepoints <= _HANGUL_END))
+    # Japanese: Hiragana and Katakana (contiguous blocks)
+    japanese_chars = np.count_nonzero((codepoints >= _HIRAGANA_START) & (codepoints <= _KATAKANA_END))
+    # Chinese: CJK Unified Ideographs (common Chinese characters)
+    chinese_chars = np.count_nonzero((codepoints >= _CJK_START) & (codepoints <= _CJK_END))
+    total_chars = np.count_nonzero(codepoints > _SPACE)
+    return korean_chars, japanese_chars, chinese_chars, total_chars
+
+
+def _count_scripts_loop(codepoints: 'np.ndarray') -> tuple:
+    """Count (Korean, Japanese, Chinese, non-whitespace) codepoints in one pass, for Numba."""
+    korean_chars = japanese_chars = chinese_chars = total_chars = 0
+    decided_at = _CJK_THRESHOLD * len(codepoints)
+    for i in range(len(codepoints)):
+        if i % _EARLY_EXIT_STRIDE == 0 and korean_chars > decided_at:
+            break
+        c = codepoints[i]
+        if c <= 0x20:
+            continue
+        total_chars += 1
+        if 0xAC00 <= c <= 0xD7A3:
+            korean_chars += 1
+        elif 0x3040 <= c <= 0x30FF:
+            japanese_chars += 1
+        elif 0x4E00 <= c <= 0x9FFF:
+            chinese_chars += 1
+    return korean_chars, japanese_chars, chinese_chars, total_chars
+
+
+@lru_cache(maxsize=1)
+def _get_ko_ratio():
+    """Return the compiled Korean ratio kernel, or the NumPy one if numba is missing."""
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional
+        return _ko_ratio_numpy
+    return njit(cache=True, boundscheck=False, nogil=True)(_ko_ratio_loop)
+
+
+@lru_cache(maxsize=1)
+def _get_count_scripts():
+    """Return the compiled CJK counting kernel, or the NumPy one if numba is missing."""
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional
+        return _count_scripts_numpy
+    return njit(cache=True, boundscheck=False, nogil=True)(_count_scripts_loop)
+
+
+def warmup() -> None:
+    """
+    Compile (or load from numba's on-disk cache) the long-text kernels ahead of time,
+    so the first long request does not pay for JIT compilation.
+    """
+    if _count_scripts_compiled is not None or np is None:
+        return  # the Cython counter or the pure-Python paths need no compilation
+    codepoints = _to_codepoints('\uac00a')
+    _get_ko_ratio()(codepoints)
+    _get_count_scripts()(codepoints)
+
+
+@_memoize_inputs
+def detect_language(text: str) -> str:
+    """
+    Simple language detection based on character analysis.
+    Returns 'ko' for Korean, 'en' for English.
+    """
+    # ASCII text (the common English case) cannot contain Hangul; isascii()
+    # reads a flag CPython keeps on the string instead of scanning it. Other
+    # text without a single Hangul syllable (accented Latin, Cyrillic,
+    # kana-only...) is settled by a C-level search that stops at the first hit
+    if text.isascii() or not _HANGUL_RE.search(text):
+        return 'en'
+
+    if _count_scripts_compiled is not None:
+        # The compiled loop beats every other counter at any length
+        korean_chars, _, _, total_chars = _count_scripts_compiled(text)
+        korean_ratio = korean_chars / total_chars if total_chars else 0.0
+    elif len(text) < _VECTORIZE_MIN_CHARS:
+        korean_chars = len(_HANGUL_RE.findall(text))
+        total_chars = len(_NONSPACE_RE.findall(text))
+        korean_ratio = korean_chars / total_chars if total_chars else 0.0
+    elif np is None:
+        korean_ratio = _ko_ratio_utf8(text)
+    else:
+        korean_ratio = _get_ko_ratio()(_to_codepoints(text))
+
+    # If more than 30% Korean characters, consider it Korean
+    return 'ko' if korean_ratio > _KO_THRESHOLD else 'en'
+
+
+@_memoize_inputs
+def detect_cjk_language(text: str) -> str:
+    """
+    Enhanced language detection for Korean, Japanese, Chinese, and English
+    Returns: language code ('ko', 'ja', 'zh', or 'en')
+    """
+    # Empty and pure-ASCII text has no CJK characters. Other whitespace-only
+    # text needs no strip() copy: it has no script counts and falls through to 'en'
+    if text.isascii():
+        return 'en'
+    # Without any Hangul, kana or ideograph every ratio is zero; skip counting
+    if not _CJK_SCRIPT_RE.search(text):
+        return 'en'
+
+    if _count_scripts_compiled is not None:
+        korean_chars, japanese_chars, chinese_chars, total_chars = _count_scripts_compiled(text)
+    elif np is not None and len(text) >= _CJK_VECTORIZE_MIN_CHARS:
+        # View the text as an array of codepoints so each count is a vectorized scan
+        korean_chars, japanese_chars, chinese_chars, total_chars = _get_count_scripts()(_to_codepoints(text))
+    elif len(text) >= _UTF8_SCAN_MIN_CHARS:
+        # Medium text (or no NumPy): count on the UTF-8 bytes in C
+        korean_chars, japanese_chars, chinese_chars, total_chars = _count_scripts_utf8(text)
+    else:
+        # Very short text: one pass buckets every character
+        korean_chars, japanese_chars, chinese_chars, total_chars = _count_scripts_python(text)
+
+    if total_chars == 0:
+        return 'en'
+
+    # Calculate ratios
+    korean_ratio = korean_chars / total_chars
+    japanese_ratio = japanese_chars / total_chars
+    chinese_ratio = chinese_chars / total_chars
+
+    # Determine language (threshold: 20%)
+    if korean_ratio > _CJK_THRESHOLD:
+        return 'ko'
+    elif japanese_ratio > _CJK_THRESHOLD:
+        return 'ja'
+    elif chinese_ratio > _CJK_THRESHOLD:
+        return 'zh'
+    else:
+        return 'en'
@@ -1,15 +1,29 @@
 """
 Core translation module using NLLB-200-distilled-600M model.
 """
+import contextlib
+import os
+import threading
+import time
+from collections import OrderedDict
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
-from typing import Optional, List
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, BitsAndBytesConfig, TextIteratorStreamer
+from typing import Iterator, Optional, List
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _cpu_supports_bf16() -> bool:
+    """Whether the CPU has native BF16 instructions (e.g. AVX-512 BF16)."""
+    is_supported = getattr(torch.cpu, '_is_avx512_bf16_supported', None)
+    try:
+        return bool(is_supported and is_supported())
+    except Exception:
+        return False
+
+
 class Translator:
     """
     A translator class that uses the NLLB-200-distilled-600M model
@@ -30,36 +44,345 @@ class Translator:
         'pt': 'por_Latn',  # Portuguese
         'it': 'ita_Latn',  # Italian
     }
+    _NLLB_CODES = frozenset(LANGUAGE_CODES.values())
+
+    # Maximum number of translations kept in the in-memory LRU cache
+    CACHE_SIZE = 512
+
+    # Supported values for the `quantization` constructor argument
+    QUANTIZATION_MODES = ('int8',)
+
+    # Inference backends: PyTorch ('pt') or a model converted for CTranslate2 ('ct2')
+    BACKENDS = ('pt', 'ct2')
+
+    # Supported values for the `precision` constructor argument
+    PRECISION_DTYPES = {
+        'fp32': torch.float32,
+        'fp16': torch.float16,
+        'bf16': torch.bfloat16,
+    }
 
-    def __init__(self, model_name: str = "facebook/nllb-200-distilled-600M", use_gpu: bool = True):
+    # Greedy decoding with the decoder KV cache: each step attends over cached
+    # keys/values instead of recomputing them for the whole prefix
+    GENERATION_KWARGS = {
+        'num_beams': 1,
+        'do_sample': False,
+        'use_cache': True,
+    }
+
+    def __init__(
+        self,
+        model_name: str = "facebook/nllb-200-distilled-600M",
+        use_gpu: bool = True,
+        quantization: Optional[str] = None,
+        precision: Optional[str] = None,
+        compile_model: bool = False,
+        backend: str = 'pt',
+        ct2_model_path: Optional[str] = None,
+        warmup: bool = True,
+        num_threads: Optional[int] = None,
+        lazy: bool = False
+    ):
         """
         Initialize the translator with the specified model.
 
         Args:
             model_name: HuggingFace model identifier
             use_gpu: Whether to use GPU if available (default: True)
+            quantization: Optional weight quantization ('int8' applies dynamic
+                int8 quantization to Linear layers on CPU, and loads 8-bit
+                bitsandbytes weights on GPU)
+            precision: Optional weight dtype ('fp32', 'fp16' or 'bf16'); defaults to
+                fp16 on GPU and fp32 on CPU. fp16 is GPU only.
+            compile_model: Fuse kernels with BetterTransformer (if optimum is
+                installed) and torch.compile; the first translations pay the compile cost
+            backend: 'pt' runs the PyTorch model; 'ct2' runs a CTranslate2 conversion
+                of it (see convert_to_ct2.py), with the tokenizer still loaded from model_name
+            ct2_model_path: Directory of the converted model (required for 'ct2')
+            warmup: Run a short translation in each direction so the first real
+                request does not pay one-time kernel/allocator/compile costs
+            num_threads: CPU threads for inference (default: $TRANSLATOR_THREADS,
+                or all cores); ignored on GPU
+            lazy: Load only the tokenizer now and defer the model to ensure_loaded()
+                (called by the first translation)
         """
-        logger.info(f"Loading model: {model_name}")
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unsupported backend: {backend}. "
+                f"Supported backends: {', '.join(self.BACKENDS)}"
+            )
+        if backend == 'ct2' and ct2_model_path is None:
+            raise ValueError("backend='ct2' requires ct2_model_path")
+        if quantization is not None and quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unsupported quantization: {quantization}. "
+                f"Supported modes: {', '.join(self.QUANTIZATION_MODES)}"
+            )
+        if precision is not None and precision not in self.PRECISION_DTYPES:
+            raise ValueError(
+                f"Unsupported precision: {precision}. "
+                f"Supported precisions: {', '.join(self.PRECISION_DTYPES)}"
+            )
+        if quantization is not None and precision not in (None, 'fp32'):
+            raise ValueError("Quantization requires fp32 weights")
+
         self.model_name = model_name
+        self.quantization = quantization
+        self.backend = backend
 
         # Determine device
+        self.num_threads = None
         if use_gpu and torch.cuda.is_available():
             self.device = 0
             logger.info("Using GPU for translation")
         else:
             self.device = -1
             logger.info("Using CPU for translation")
+            self.num_threads = self._configure_cpu_threads(num_threads)
 
-        # Load model and tokenizer
+        if backend == 'ct2':
+            # CTranslate2 picks its own kernels; int8 maps to its compute_type
+            if precision is not None or compile_model:
+                logger.warning("precision/compile_model apply to the PyTorch backend only; ignoring")
+            self.precision = None
+        else:
+            # Half precision halves weight/activation traffic on GPU
+            # (on GPU this is also the compute dtype of 8-bit bitsandbytes layers)
+            self.precision = precision or ('fp16' if self.device == 0 else 'fp32')
+            if self.precision == 'fp16' and self.device == -1:
+                logger.warning("FP16 weights are GPU-only; using FP32 on CPU")
+                self.precision = 'fp32'
+            logger.info(f"Using {self.precision} weights")
+
+        # Model loading settings, used by ensure_loaded()
+        self._ct2_model_path = ct2_model_path
+        self._precision_arg = precision
+        self._compile_on_load = compile_model
+        self._warmup_on_load = warmup
+        self.model = None
+        self.use_bf16 = False
+        self._model_loaded = False
+        self._load_lock = threading.Lock()
+
+        # The tokenizer is small and enough for the language tables, so it is
+        # loaded up front even when the model itself is loaded lazily
         try:
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            logger.info("Model and tokenizer loaded successfully")
         except Exception as e:
-            logger.error(f"Failed to load model: {e}")
+            logger.error(f"Failed to load tokenizer: {e}")
             raise
 
-        self._pipeline = None
+        # Target language token ids passed to generate() as forced_bos_token_id
+        self._tgt_bos = {
+            code: self.tokenizer.convert_tokens_to_ids(code)
+            for code in self.LANGUAGE_CODES.values()
+        }
+        # tokenizer.src_lang is shared state; hold this while setting it and encoding
+        self._tokenizer_lock = threading.Lock()
+        # One generate() at a time on the PyTorch model: callers on different threads
+        # (the web batcher and streaming requests) take turns instead of running
+        # concurrently on the same weights and compiled/fused forward
+        self._model_lock = threading.Lock()
+
+        # LRU cache of recent translations: (text, src_code, tgt_code, max_length) -> translation
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        if not lazy:
+            self.ensure_loaded()
+
+    @property
+    def model_loaded(self) -> bool:
+        """Whether the model is loaded and translations can run without waiting."""
+        return self._model_loaded
+
+    def ensure_loaded(self):
+        """
+        Load the model if it is not loaded yet (then warm it up, if enabled).
+
+        Safe to call from several threads: one loads, the others wait for it.
+        Called by every translation, so lazy translators load on first use.
+        """
+        if self._model_loaded:
+            return
+
+        with self._load_lock:
+            if self._model_loaded:
+                return
+
+            logger.info(f"Loading model: {self.model_name}")
+            try:
+                if self.backend == 'ct2':
+                    self.model = self._load_ct2_model(self._ct2_model_path)
+                else:
+                    load_kwargs = {}
+                    if self.quantization == 'int8' and self.device == 0:
+                        # Weight-only int8 via bitsandbytes, placed on the GPU at load time
+                        load_kwargs = {
+                            'quantization_config': BitsAndBytesConfig(load_in_8bit=True),
+                            'device_map': {'': 0},
+                        }
+                    self.model = self._load_model(
+                        self.model_name, self.PRECISION_DTYPES[self.precision], **load_kwargs
+                    )
+                logger.info("Model loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load model: {e}")
+                raise
+
+            if self.backend == 'pt':
+                self._prepare_torch_model(self.quantization, self._precision_arg, self._compile_on_load)
+            self._model_loaded = True
+
+        # Outside the lock: warmup() translates, which calls back into ensure_loaded()
+        if self._warmup_on_load:
+            self.warmup()
+
+    def warmup(self):
+        """Run throwaway translations (bypassing the cache) to trigger lazy initialization."""
+        start = time.perf_counter()
+        try:
+            self._generate(["Hello world."], 'eng_Latn', 'kor_Hang', 64)
+            self._generate(["안녕하세요"], 'kor_Hang', 'eng_Latn', 64)
+        except Exception as e:
+            logger.warning(f"Warmup failed: {e}")
+            return
+        logger.info(f"Warmup complete in {time.perf_counter() - start:.1f}s")
+
+    @staticmethod
+    def _configure_cpu_threads(num_threads: Optional[int]) -> int:
+        """
+        Size PyTorch's intra-op (and inter-op) thread pools for CPU inference.
+
+        Args:
+            num_threads: Requested thread count, or None for $TRANSLATOR_THREADS / all cores
+
+        Returns:
+            Number of intra-op threads in use
+        """
+        if not num_threads:
+            env_threads = os.environ.get('TRANSLATOR_THREADS', '').strip()
+            try:
+                num_threads = int(env_threads) if env_threads else None
+            except ValueError:
+                logger.warning(f"Ignoring invalid TRANSLATOR_THREADS={env_threads!r}; using all cores")
+        n = num_threads if num_threads and num_threads > 0 else os.cpu_count() or 1
+        torch.set_num_threads(n)
+        try:
+            torch.set_num_interop_threads(max(1, n // 4))
+        except RuntimeError:
+            # Only settable once, before any inter-op parallel work has started
+            pass
+        logger.info(f"Using {n} CPU threads")
+        return n
+
+    @staticmethod
+    def _load_model(model_name: str, dtype: torch.dtype, **kwargs):
+        """
+        Load the seq2seq model, preferring PyTorch's fused SDPA attention kernels.
+
+        Args:
+            model_name: HuggingFace model identifier
+            dtype: Weight dtype
+            **kwargs: Extra from_pretrained() arguments (e.g. quantization_config)
+
+        Returns:
+            Loaded model
+        """
+        try:
+            return AutoModelForSeq2SeqLM.from_pretrained(
+                model_name, torch_dtype=dtype, attn_implementation='sdpa', **kwargs
+            )
+        except (TypeError, ValueError, ImportError) as e:
+            # Older transformers/torch releases lack SDPA support for this model
+            logger.info(f"SDPA attention unavailable ({e}); using eager attention")
+            return AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=dtype, **kwargs)
+
+    def _load_ct2_model(self, model_path: str):
+        """
+        Load a CTranslate2 conversion of the model.
+
+        Args:
+            model_path: Directory produced by convert_to_ct2.py
+
+        Returns:
+            ctranslate2.Translator
+        """
+        try:
+            import ctranslate2
+        except ImportError as e:
+            raise ImportError("backend='ct2' requires ctranslate2 (pip install ctranslate2)") from e
+
+        compute_type = 'default'  # the type the model was converted with
+        if self.quantization == 'int8':
+            compute_type = 'int8_float16' if self.device == 0 else 'int8'
+        return ctranslate2.Translator(
+            model_path,
+            device='cuda' if self.device == 0 else 'cpu',
+            compute_type=compute_type,
+            intra_threads=self.num_threads or 0  # 0 lets CTranslate2 choose
+        )
+
+    def _prepare_torch_model(self, quantization: Optional[str], precision: Optional[str], compile_model: bool):
+        """Quantize, place and optionally compile the loaded PyTorch model."""
+        if quantization == 'int8':
+            if self.device == -1:
+                # Dynamic int8 weights for Linear layers; activations are quantized on the fly
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Applied dynamic int8 quantization")
+            else:
+                logger.info("Loaded 8-bit bitsandbytes weights")
+
+        # BF16 autocast on CPUs with native support, unless a precision was chosen
+        # explicitly; quantized Linear layers expect FP32 inputs
+        self.use_bf16 = (
+            self.device == -1 and quantization is None and precision is None
+            and _cpu_supports_bf16()
+        )
+        if self.use_bf16:
+            logger.info("Using BF16 autocast on CPU")
+
+        # The model is driven directly (no transformers pipeline), so place it once;
+        # bitsandbytes models were placed by device_map and cannot be moved
+        self._torch_device = torch.device('cuda:0' if self.device == 0 else 'cpu')
+        if not (quantization == 'int8' and self.device == 0):
+            self.model.to(self._torch_device)
+        # Inference only: make sure dropout is off regardless of how the model was loaded
+        self.model.eval()
+
+        # Some checkpoints ship with the KV cache disabled; generate() falls back to
+        # model.config when the generation config leaves it unset
+        self.model.config.use_cache = True
+
+        if compile_model:
+            self._compile_model()
+
+    def _compile_model(self):
+        """Apply optional kernel fusion to the loaded model; failures keep the eager model."""
+        if self.quantization is not None:
+            logger.warning("Model compilation is not supported with quantization; skipping")
+            return
+
+        try:
+            from optimum.bettertransformer import BetterTransformer
+        except ImportError:  # optimum is optional
+            BetterTransformer = None
+        if BetterTransformer is not None:
+            try:
+                self.model = BetterTransformer.transform(self.model)
+                logger.info("Applied BetterTransformer")
+            except Exception as e:
+                logger.warning(f"BetterTransformer not applied: {e}")
+
+        if hasattr(torch, 'compile'):
+            # Compile forward() rather than wrapping the module, so that
+            # generate() keeps working and calls the compiled forward each step
+            self.model.forward = torch.compile(self.model.forward, dynamic=True)
+            logger.info("Compiled model forward with torch.compile")
+        else:
+            logger.warning("torch.compile requires PyTorch 2.0+; skipping")
 
     def _get_language_code(self, lang: str) -> str:
         """
@@ -71,19 +394,141 @@ class Translator:
         Returns:
             NLLB formatted language code
         """
-        # If already in NLLB format, return as is
+        # Known NLLB codes and simple codes resolve with a single hash lookup
+        if lang in self._NLLB_CODES:
+            return lang
+        code = self.LANGUAGE_CODES.get(lang.casefold())
+        if code is not None:
+            return code
+
+        # Any other NLLB format code (e.g. 'vie_Latn') is passed through as is
         if '_' in lang:
             return lang
+        raise ValueError(
+            f"Unsupported language code: {lang}. "
+            f"Supported codes: {', '.join(self.LANGUAGE_CODES.keys())}"
+        )
+
+    def _encode(self, texts: List[str], src_code: str, max_length: int):
+        """Tokenize texts as src_code and move the tensors to the model device."""
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_code
+            inputs = self.tokenizer(
+                texts,
+                return_tensors='pt',
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            )
+        return inputs.to(self._torch_device)
 
-        # Convert from simple code
-        lang_lower = lang.lower()
-        if lang_lower in self.LANGUAGE_CODES:
-            return self.LANGUAGE_CODES[lang_lower]
-        else:
-            raise ValueError(
-                f"Unsupported language code: {lang}. "
-                f"Supported codes: {', '.join(self.LANGUAGE_CODES.keys())}"
+    def _forced_bos_token_id(self, tgt_code: str) -> int:
+        """Token id that starts generation in the target language."""
+        forced_bos_token_id = self._tgt_bos.get(tgt_code)
+        if forced_bos_token_id is None:
+            forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(tgt_code)
+        return forced_bos_token_id
+
+    def _generate(self, texts: List[str], src_code: str, tgt_code: str, max_length: int) -> List[str]:
+        """
+        Tokenize, generate and decode a batch of texts in one language direction.
+
+        Args:
+            texts: Texts to translate
+            src_code: NLLB source language code
+            tgt_code: NLLB target language code
+            max_length: Maximum length of input and generated tokens
+
+        Returns:
+            Translated texts, in input order
+        """
+        self.ensure_loaded()
+        if self.backend == 'ct2':
+            return self._generate_ct2(texts, src_code, tgt_code, max_length)
+
+        inputs = self._encode(texts, src_code, max_length)
+        with self._model_lock, torch.inference_mode(), self._autocast():
+            output_ids = self.model.generate(
+                **inputs,
+                forced_bos_token_id=self._forced_bos_token_id(tgt_code),
+                max_length=max_length,
+                **self.GENERATION_KWARGS
             )
+        return self.tokenizer.batch_decode(
+            output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+        )
+
+    def _generate_ct2(self, texts: List[str], src_code: str, tgt_code: str, max_length: int) -> List[str]:
+        """CTranslate2 counterpart of _generate(): tokens in, target-prefixed tokens out."""
+        with self._tokenizer_lock:
+            self.tokenizer.src_lang = src_code
+            input_ids = self.tokenizer(texts, truncation=True, max_length=max_length)['input_ids']
+        source = [self.tokenizer.convert_ids_to_tokens(ids) for ids in input_ids]
+
+        results = self.model.translate_batch(
+            source,
+            target_prefix=[[tgt_code]] * len(texts),
+            max_decoding_length=max_length,
+            beam_size=self.GENERATION_KWARGS['num_beams']
+        )
+        # Each hypothesis starts with the forced target language token
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0][1:]),
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=False
+            )
+            for result in results
+        ]
+
+    def _autocast(self):
+        """Context manager applying BF16 autocast when enabled, otherwise a no-op."""
+        if self.use_bf16:
+            return torch.autocast(device_type='cpu', dtype=torch.bfloat16)
+        return contextlib.nullcontext()
+
+    def _cache_get(self, key: tuple) -> Optional[str]:
+        """Return a cached translation and mark it as recently used."""
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple, value: str):
+        """Store a translation, evicting the least recently used entry on overflow."""
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def get_cached(
+        self,
+        text: str,
+        src_lang: str = 'en',
+        tgt_lang: str = 'ko',
+        max_length: int = 512
+    ) -> Optional[str]:
+        """
+        Look up a previous translation without running the model.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code (e.g., 'en', 'ko', or 'eng_Latn')
+            tgt_lang: Target language code (e.g., 'en', 'ko', or 'kor_Hang')
+            max_length: Maximum length of generated translation
+
+        Returns:
+            Cached translated text, or None if this request has not been translated yet
+        """
+        key = (text, self._get_language_code(src_lang), self._get_language_code(tgt_lang), max_length)
+        return self._cache_get(key)
+
+    def clear_cache(self):
+        """Drop all cached translations."""
+        with self._cache_lock:
+            self._cache.clear()
 
     def translate(
         self,
@@ -112,22 +557,17 @@ class Translator:
             src_code = self._get_language_code(src_lang)
             tgt_code = self._get_language_code(tgt_lang)
 
-            logger.info(f"Translating from {src_code} to {tgt_code}")
+            # Repeated inputs are served from the cache without running the model
+            cache_key = (text, src_code, tgt_code, max_length)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
 
-            # Create pipeline with specified languages
-            translation_pipeline = pipeline(
-                "translation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang=src_code,
-                tgt_lang=tgt_code,
-                max_length=max_length,
-                device=self.device
-            )
+            logger.info(f"Translating from {src_code} to {tgt_code}")
 
             # Perform translation
-            result = translation_pipeline(text)
-            translated_text = result[0]['translation_text']
+            translated_text = self._generate([text], src_code, tgt_code, max_length)[0]
+            self._cache_put(cache_key, translated_text)
 
             return translated_text
 
@@ -135,6 +575,83 @@ class Translator:
             logger.error(f"Translation error: {e}")
             raise
 
+    def translate_stream(
+        self,
+        text: str,
+        src_lang: str = 'en',
+        tgt_lang: str = 'ko',
+        max_length: int = 512
+    ) -> Iterator[str]:
+        """
+        Translate text, yielding pieces of the translation as they are generated.
+
+        Args:
+            text: Text to translate
+            src_lang: Source language code (e.g., 'en', 'ko', or 'eng_Latn')
+            tgt_lang: Target language code (e.g., 'en', 'ko', or 'kor_Hang')
+            max_length: Maximum length of generated translation
+
+        Returns:
+            Iterator over text pieces; joined, they equal translate()'s result
+        """
+        if not text or not text.strip():
+            return
+
+        src_code = self._get_language_code(src_lang)
+        tgt_code = self._get_language_code(tgt_lang)
+
+        cache_key = (text, src_code, tgt_code, max_length)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        # CTranslate2 has no streamer hook here; emit the whole result at once
+        if self.backend == 'ct2':
+            translated_text = self._generate([text], src_code, tgt_code, max_length)[0]
+            self._cache_put(cache_key, translated_text)
+            yield translated_text
+            return
+
+        self.ensure_loaded()
+        inputs = self._encode([text], src_code, max_length)
+        streamer = TextIteratorStreamer(
+            self.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False
+        )
+        errors = []
+
+        def run_generate():
+            # inference_mode and autocast are thread-local, so enter them here
+            try:
+                with self._model_lock, torch.inference_mode(), self._autocast():
+                    self.model.generate(
+                        **inputs,
+                        forced_bos_token_id=self._forced_bos_token_id(tgt_code),
+                        max_length=max_length,
+                        streamer=streamer,
+                        **self.GENERATION_KWARGS
+                    )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()  # unblock the consumer below
+
+        thread = threading.Thread(target=run_generate, name='translation-stream', daemon=True)
+        thread.start()
+
+        pieces = []
+        for piece in streamer:
+            pieces.append(piece)
+            yield piece
+        thread.join()
+
+        if errors:
+            logger.error(f"Translation error: {errors[0]}")
+            raise errors[0]
+        self._cache_put(cache_key, ''.join(pieces))
+
     def translate_batch(
         self,
         texts: List[str],
@@ -164,22 +681,41 @@ class Translator:
             src_code = self._get_language_code(src_lang)
             tgt_code = self._get_language_code(tgt_lang)
 
-            logger.info(f"Batch translating {len(texts)} texts from {src_code} to {tgt_code}")
-
-            # Create pipeline
-            translation_pipeline = pipeline(
-                "translation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                src_lang=src_code,
-                tgt_lang=tgt_code,
-                max_length=max_length,
-                device=self.device
-            )
-
-            # Perform batch translation
-            results = translation_pipeline(texts, batch_size=batch_size)
-            translated_texts = [result['translation_text'] for result in results]
+            # Serve cached texts and translate each distinct remaining text once
+            translated_texts = [None] * len(texts)
+            pending = {}  # text -> indices in texts
+            for i, text in enumerate(texts):
+                cached = self._cache_get((text, src_code, tgt_code, max_length))
+                if cached is not None:
+                    translated_texts[i] = cached
+                else:
+                    pending.setdefault(text, []).append(i)
+
+            if pending:
+                unique_texts = list(pending)
+                logger.info(
+                    f"Batch translating {len(unique_texts)} texts from {src_code} to {tgt_code}"
+                )
+
+                # Group texts of similar token length so each batch pads to a
+                # length close to its members' instead of the longest overall.
+                # The fast tokenizer's truncation/padding state is shared, so
+                # measure under the same lock as _encode()
+                with self._tokenizer_lock:
+                    lengths = [
+                        len(ids)
+                        for ids in self.tokenizer(unique_texts, add_special_tokens=False)['input_ids']
+                    ]
+                order = sorted(range(len(unique_texts)), key=lengths.__getitem__)
+
+                # Perform batch translation, one padded tokenizer call per batch
+                for start in range(0, len(order), batch_size):
+                    bucket = [unique_texts[j] for j in order[start:start + batch_size]]
+                    outputs = self._generate(bucket, src_code, tgt_code, max_length)
+                    for text, output in zip(bucket, outputs):
+                        self._cache_put((text, src_code, tgt_code, max_length), output)
+                        for i in pending[text]:
+                            translated_texts[i] = output
 
             return translated_texts
 
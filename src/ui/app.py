@@ -3,14 +3,21 @@
 Flask web UI for local translator.
 Supports Korean <-> English translation with web interface.
 """
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from pathlib import Path
+import json
+import queue
+import re
 import sys
+import threading
+import time
 import logging
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.lang_detect import detect_language, warmup as warmup_lang_detect
 from src.translator import Translator
 
 # Configure logging
@@ -21,23 +28,143 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False  # Enable Korean characters in JSON
 
-# Global translator instance
+# Global translator instance (its model loads in the background, see create_app())
 translator = None
+_model_load_error = None
+
+# Micro-batching: concurrent requests that arrive within BATCH_WINDOW_SECONDS
+# of each other are translated together in one generate() call
+BATCH_WINDOW_SECONDS = 0.01
+MAX_BATCH_SIZE = 8
+REQUEST_TIMEOUT_SECONDS = 30
+_request_queue = queue.Queue()  # (text, src_lang, tgt_lang, Future)
+
+# Longer inputs are translated sentence by sentence: attention cost grows with
+# the square of the input length, and long inputs would be truncated
+LONG_TEXT_CHARS = 200
+# (CJK full stops are often not followed by a space)
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])\s*')
+
+
+def _batch_worker():
+    """Drain queued requests and translate them in batches grouped by language pair."""
+    while True:
+        jobs = [_request_queue.get()]
+        deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+        while len(jobs) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(_request_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Jobs whose request already timed out were cancelled; skip them
+        jobs = [job for job in jobs if job[3].set_running_or_notify_cancel()]
+
+        groups = {}
+        for job in jobs:
+            groups.setdefault((job[1], job[2]), []).append(job)
+
+        for (src_lang, tgt_lang), group in groups.items():
+            try:
+                translations = translator.translate_batch(
+                    [job[0] for job in group], src_lang=src_lang, tgt_lang=tgt_lang
+                )
+            except Exception as e:
+                for job in group:
+                    job[3].set_exception(e)
+            else:
+                for job, translation in zip(group, translations):
+                    job[3].set_result(translation)
 
 
-def detect_language(text: str) -> str:
-    """
-    Simple language detection based on character analysis.
-    Returns 'ko' for Korean, 'en' for English.
-    """
-    korean_chars = sum(1 for char in text if '\uac00' <= char <= '\ud7a3')
-    total_chars = len([char for char in text if char.strip()])
+def _submit(text: str, src_lang: str, tgt_lang: str) -> Future:
+    """Queue a translation for the batch worker."""
+    future = Future()
+    _request_queue.put((text, src_lang, tgt_lang, future))
+    return future
+
+
+def _split_sentences(text: str) -> list:
+    """Split a line into sentences after terminal punctuation."""
+    return [sentence for sentence in _SENTENCE_END_RE.split(text) if sentence]
+
+
+def _segment_text(text: str) -> list:
+    """Sentences to translate, grouped by input line; short text is one segment."""
+    if len(text) <= LONG_TEXT_CHARS:
+        return [[text]]
+    # Line breaks (including empty lines) are kept as in the input
+    return [_split_sentences(line.strip()) for line in text.split('\n')]
+
+
+def _translate_batched(text: str, src_lang: str, tgt_lang: str) -> str:
+    """Translate text through the batch worker and wait for the result."""
+    # Queue every sentence up front so the worker batches them together
+    lines = [
+        [_submit(sentence, src_lang, tgt_lang) for sentence in sentences]
+        for sentences in _segment_text(text)
+    ]
+    # The timeout bounds the whole request, not each sentence
+    deadline = time.monotonic() + REQUEST_TIMEOUT_SECONDS
+    try:
+        return '\n'.join(
+            ' '.join(
+                future.result(timeout=max(0, deadline - time.monotonic()))
+                for future in futures
+            )
+            for futures in lines
+        )
+    except FutureTimeoutError:
+        # Drop the sentences the batch worker has not started on yet
+        for futures in lines:
+            for future in futures:
+                future.cancel()
+        raise
+
+
+def _load_model():
+    """Load the translator's model; run on a background thread at startup."""
+    global _model_load_error
+    try:
+        translator.ensure_loaded()
+        logger.info("Model loaded; ready to translate")
+    except Exception as e:
+        _model_load_error = str(e)
+        logger.error(f"Failed to load model: {e}")
+
+
+def _model_not_ready():
+    """503 response for translation requests that arrive before the model is loaded."""
+    return jsonify({
+        'success': False,
+        'error': _model_load_error or '모델을 불러오는 중입니다 / Model is still loading'
+    }), 503
+
+
+def _resolve_languages(text: str, data: dict) -> tuple:
+    """Pick (src_lang, tgt_lang, detected_lang) from the request, auto-detecting if enabled."""
+    # Get parameters
+    auto_detect = data.get('auto_detect', True)
+    src_lang = data.get('src_lang', 'en')
+    tgt_lang = data.get('tgt_lang', 'ko')
 
-    if total_chars == 0:
-        return 'en'
+    # Auto-detect language if enabled
+    detected_lang = None
+    if auto_detect:
+        detected_lang = detect_language(text)
+        if detected_lang == 'ko':
+            src_lang, tgt_lang = 'ko', 'en'
+        else:
+            src_lang, tgt_lang = 'en', 'ko'
+    return src_lang, tgt_lang, detected_lang
 
-    korean_ratio = korean_chars / total_chars
-    return 'ko' if korean_ratio > 0.3 else 'en'
+
+def _sse_event(payload: dict) -> str:
+    """Format a payload as one server-sent event."""
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
 
 @app.route('/')
@@ -85,23 +212,16 @@ def translate():
                 'error': 'Empty text'
             }), 400
 
-        # Get parameters
-        auto_detect = data.get('auto_detect', True)
-        src_lang = data.get('src_lang', 'en')
-        tgt_lang = data.get('tgt_lang', 'ko')
-
-        # Auto-detect language if enabled
-        detected_lang = None
-        if auto_detect:
-            detected_lang = detect_language(text)
-            if detected_lang == 'ko':
-                src_lang, tgt_lang = 'ko', 'en'
-            else:
-                src_lang, tgt_lang = 'en', 'ko'
+        src_lang, tgt_lang, detected_lang = _resolve_languages(text, data)
 
         # Perform translation
         logger.info(f"Translating from {src_lang} to {tgt_lang}")
-        translation = translator.translate(text, src_lang=src_lang, tgt_lang=tgt_lang)
+        # Repeated inputs are answered from the translator's LRU cache without queueing
+        translation = translator.get_cached(text, src_lang=src_lang, tgt_lang=tgt_lang)
+        if translation is None:
+            if not translator.model_loaded:
+                return _model_not_ready()
+            translation = _translate_batched(text, src_lang, tgt_lang)
 
         return jsonify({
             'success': True,
@@ -111,14 +231,89 @@ def translate():
             'tgt_lang': tgt_lang
         })
 
+    except FutureTimeoutError:
+        logger.error('Translation timed out after %ss', REQUEST_TIMEOUT_SECONDS)
+        return jsonify({
+            'success': False,
+            'error': '번역 시간이 초과되었습니다 / Translation timed out'
+        }), 504
+
     except Exception as e:
-        logger.error(f"Translation error: {e}", exc_info=True)
+        # Tracebacks are only collected when debug logging is on
+        logger.error('Translation error: %s', e)
+        logger.debug('Translation error traceback', exc_info=True)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@app.route('/api/translate_stream', methods=['POST'])
+def translate_stream():
+    """
+    Streaming translation API endpoint (server-sent events).
+
+    Request JSON: same as /api/translate
+
+    Response events:
+        data: {"token": "partial translation"}
+        ...
+        data: {"done": true, "detected_lang": "en", "src_lang": "en", "tgt_lang": "ko"}
+
+    On failure after the stream has started, the last event is
+        data: {"error": "message"}
+
+    Responds 503 (JSON, as /api/translate) while the model is still loading.
+    """
+    data = request.get_json()
+
+    if not data or 'text' not in data:
+        return jsonify({
+            'success': False,
+            'error': 'No text provided'
+        }), 400
+
+    text = data['text'].strip()
+
+    if not text:
+        return jsonify({
+            'success': False,
+            'error': 'Empty text'
+        }), 400
+
+    src_lang, tgt_lang, detected_lang = _resolve_languages(text, data)
+    if not translator.model_loaded:
+        return _model_not_ready()
+
+    def events():
+        # Streamed requests bypass the micro-batcher (tokens go straight to the
+        # client) but share the translator's model lock with it. Long text is
+        # streamed sentence by sentence, with the same separators as /api/translate
+        try:
+            for line_no, sentences in enumerate(_segment_text(text)):
+                if line_no:
+                    yield _sse_event({'token': '\n'})
+                for sentence_no, sentence in enumerate(sentences):
+                    if sentence_no:
+                        yield _sse_event({'token': ' '})
+                    for piece in translator.translate_stream(sentence, src_lang=src_lang, tgt_lang=tgt_lang):
+                        yield _sse_event({'token': piece})
+        except Exception as e:
+            logger.error('Translation error: %s', e)
+            logger.debug('Translation error traceback', exc_info=True)
+            yield _sse_event({'error': str(e)})
+            return
+        yield _sse_event({
+            'done': True,
+            'detected_lang': detected_lang,
+            'src_lang': src_lang,
+            'tgt_lang': tgt_lang
+        })
+
+    logger.info(f"Streaming translation from {src_lang} to {tgt_lang}")
+    return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/api/supported_languages', methods=['GET'])
 def supported_languages():
     """
@@ -148,19 +343,73 @@ def supported_languages():
         }), 500
 
 
+@app.route('/api/cache_clear', methods=['POST'])
+def cache_clear():
+    """
+    Drop all cached translations.
+
+    Response JSON:
+        {
+            "success": true
+        }
+    """
+    translator.clear_cache()
+    return jsonify({'success': True})
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """
+    Health check endpoint; answers while the model is still loading.
+
+    Response JSON:
+        {
+            "success": true,
+            "status": "healthy",  # or "loading" / "error"
+            "translator_loaded": true,
+            "model_loaded": true
+        }
+    """
+    model_loaded = translator is not None and translator.model_loaded
+    if model_loaded:
+        status = 'healthy'
+    elif _model_load_error is not None:
+        status = 'error'
+    else:
+        status = 'loading'
     return jsonify({
         'success': True,
-        'status': 'healthy',
-        'translator_loaded': translator is not None
+        'status': status,
+        'translator_loaded': translator is not None,
+        'model_loaded': model_loaded
     })
 
 
+def create_app(**translator_kwargs) -> Flask:
+    """
+    Create the translator and start the background threads that serve it.
+
+    Only the tokenizer is loaded before this returns; the model loads on a
+    background thread, so /api/health and /api/supported_languages answer
+    right away. Also the entry point for external WSGI servers, e.g.
+        gunicorn -w 1 -k gthread --threads 8 'src.ui.app:create_app()'
+
+    Args:
+        translator_kwargs: Passed through to Translator
+
+    Returns:
+        The Flask app
+    """
+    global translator
+    translator = Translator(lazy=True, **translator_kwargs)
+    threading.Thread(target=_load_model, name='model-loader', daemon=True).start()
+    threading.Thread(target=_batch_worker, name='translation-batcher', daemon=True).start()
+    warmup_lang_detect()
+    return app
+
+
 def main():
     """Main function to run the Flask app."""
-    global translator
 
     import argparse
     parser = argparse.ArgumentParser(description='Flask Web UI for Local Translator')
@@ -172,14 +421,38 @@ def main():
                         help='Disable GPU usage')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug mode')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='CPU threads for inference (default: $TRANSLATOR_THREADS or all cores)')
+    parser.add_argument('--server-threads', type=int, default=8,
+                        help='Request handler threads for the waitress server (default: 8)')
+    precision = parser.add_mutually_exclusive_group()
+    precision.add_argument('--fp16', dest='precision', action='store_const', const='fp16',
+                           help='Load model weights in FP16 (GPU only; default on GPU)')
+    precision.add_argument('--bf16', dest='precision', action='store_const', const='bf16',
+                           help='Load model weights in BF16')
+    parser.add_argument('--compile', action='store_true',
+                        help='Compile the model with torch.compile (slower startup, faster inference)')
+    parser.add_argument('--quantize', type=str, choices=Translator.QUANTIZATION_MODES, default=None,
+                        help='Quantize model weights (int8: dynamic on CPU, bitsandbytes on GPU)')
+    parser.add_argument('--backend', type=str, choices=Translator.BACKENDS, default='pt',
+                        help='Inference backend (default: pt)')
+    parser.add_argument('--ct2-model', type=str, default=None,
+                        help='Converted model directory for --backend ct2 (see convert_to_ct2.py)')
 
     args = parser.parse_args()
 
-    # Initialize translator
-    logger.info("Initializing translator... This may take a minute.")
+    # Initialize translator; the model keeps loading while the server starts
+    logger.info("Initializing translator... The model loads in the background and may take a minute.")
     try:
-        translator = Translator(use_gpu=not args.no_gpu)
-        logger.info("Translator initialized successfully!")
+        create_app(
+            use_gpu=not args.no_gpu,
+            quantization=args.quantize,
+            precision=args.precision,
+            compile_model=args.compile,
+            backend=args.backend,
+            ct2_model_path=args.ct2_model,
+            num_threads=args.threads
+        )
     except Exception as e:
         logger.error(f"Failed to initialize translator: {e}")
         sys.exit(1)
@@ -193,7 +466,20 @@ def main():
         logger.info(f"  ssh -L {args.port}:localhost:{args.port} user@your-server")
         logger.info(f"  Then open: http://localhost:{args.port}")
 
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    if args.debug:
+        app.run(host=args.host, port=args.port, debug=True)
+        return
+
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("waitress is not installed; falling back to the Flask development server")
+        app.run(host=args.host, port=args.port, threaded=True)
+        return
+
+    # A single process keeps one copy of the model; handler threads overlap
+    # tokenization and HTTP I/O with generate(), which releases the GIL
+    serve(app, host=args.host, port=args.port, threads=args.server_threads)
 
 
 if __name__ == '__main__':
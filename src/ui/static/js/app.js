@@ -11,6 +11,10 @@ const targetLang = document.getElementById('targetLang');
 const charCount = document.getElementById('charCount');
 const statusMessage = document.getElementById('statusMessage');
 
+// Longer inputs are streamed from /api/translate_stream so the translation
+// appears as it is generated (matches LONG_TEXT_CHARS in app.py)
+const STREAM_MIN_CHARS = 200;
+
 // State
 let currentSrcLang = 'en';
 let currentTgtLang = 'ko';
@@ -113,41 +117,24 @@ async function performTranslation() {
     hideStatus();
 
     try {
-        const response = await fetch('/api/translate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                text: text,
-                auto_detect: autoDetect.checked,
-                src_lang: currentSrcLang,
-                tgt_lang: currentTgtLang
-            })
-        });
-
-        const data = await response.json();
-
-        if (data.success) {
-            targetText.value = data.translation;
-
-            // Update language badges
-            if (data.detected_lang) {
-                sourceLang.textContent = data.src_lang === 'ko' ? '한국어 (Korean)' : 'English';
-                targetLang.textContent = data.tgt_lang === 'ko' ? '한국어 (Korean)' : 'English';
-            } else {
-                sourceLang.textContent = currentSrcLang === 'ko' ? '한국어 (Korean)' : 'English';
-                targetLang.textContent = currentTgtLang === 'ko' ? '한국어 (Korean)' : 'English';
-            }
-
-            // Update current languages
-            currentSrcLang = data.src_lang;
-            currentTgtLang = data.tgt_lang;
-
-            showStatus('Translation completed successfully', 'success');
+        const data = text.length > STREAM_MIN_CHARS
+            ? await streamTranslation(text)
+            : await requestTranslation(text);
+
+        // Update language badges
+        if (data.detected_lang) {
+            sourceLang.textContent = data.src_lang === 'ko' ? '한국어 (Korean)' : 'English';
+            targetLang.textContent = data.tgt_lang === 'ko' ? '한국어 (Korean)' : 'English';
         } else {
-            throw new Error(data.error || 'Translation failed');
+            sourceLang.textContent = currentSrcLang === 'ko' ? '한국어 (Korean)' : 'English';
+            targetLang.textContent = currentTgtLang === 'ko' ? '한국어 (Korean)' : 'English';
         }
+
+        // Update current languages
+        currentSrcLang = data.src_lang;
+        currentTgtLang = data.tgt_lang;
+
+        showStatus('Translation completed successfully', 'success');
     } catch (error) {
         console.error('Translation error:', error);
         showStatus(`Error: ${error.message}`, 'error');
@@ -157,6 +144,79 @@ async function performTranslation() {
     }
 }
 
+// Request options shared by both translation endpoints
+function translationRequest(text) {
+    return {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            text: text,
+            auto_detect: autoDetect.checked,
+            src_lang: currentSrcLang,
+            tgt_lang: currentTgtLang
+        })
+    };
+}
+
+// Translate in one request; returns the response data
+async function requestTranslation(text) {
+    const response = await fetch('/api/translate', translationRequest(text));
+    const data = await response.json();
+
+    if (!data.success) {
+        throw new Error(data.error || 'Translation failed');
+    }
+    targetText.value = data.translation;
+    return data;
+}
+
+// Translate over server-sent events, appending tokens as they arrive;
+// returns the final "done" event (languages used)
+async function streamTranslation(text) {
+    const response = await fetch('/api/translate_stream', translationRequest(text));
+
+    if (!response.ok) {
+        // Errors before the stream starts are plain JSON, as in /api/translate
+        const data = await response.json();
+        throw new Error(data.error || 'Translation failed');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    targetText.value = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line; keep a trailing partial event
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const event of events) {
+            if (!event.startsWith('data: ')) {
+                continue;
+            }
+            const data = JSON.parse(event.slice('data: '.length));
+            if (data.error) {
+                throw new Error(data.error);
+            }
+            if (data.done) {
+                return data;
+            }
+            targetText.value += data.token;
+        }
+    }
+
+    throw new Error('Translation stream ended unexpectedly');
+}
+
 // Set translating state
 function setTranslating(translating) {
     isTranslating = translating;
@@ -0,0 +1,155 @@
+"""
+Tests for src.lang_detect.
+"""
+import pytest
+
+from src import lang_detect
+from src.lang_detect import detect_cjk_language, detect_language
+
+# A lone surrogate, as produced by a broken JSON escape such as "\ud800"
+LONE_SURROGATE = chr(0xD800)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    detect_language.cache_clear()
+    detect_cjk_language.cache_clear()
+
+
+@pytest.mark.skipif(lang_detect.np is None, reason='NumPy is not installed')
+def test_to_codepoints_keeps_lone_surrogates():
+    codepoints = lang_detect._to_codepoints('a' + LONE_SURROGATE)
+    assert codepoints.tolist() == [ord('a'), 0xD800]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('안녕하세요 ' * 20 + LONE_SURROGATE, 'ko'),
+    ('hello world ' * 20 + LONE_SURROGATE + '안녕', 'en'),
+], ids=['ko', 'en'])
+def test_detect_language_long_text_with_lone_surrogate(text, expected):
+    # Long enough for the NumPy/Numba path
+    assert len(text) >= lang_detect._VECTORIZE_MIN_CHARS
+    assert detect_language(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('日本語のテキストです。' * 20 + LONE_SURROGATE, 'ja'),
+    ('中文文本' * 40 + LONE_SURROGATE, 'zh'),
+], ids=['ja', 'zh'])
+def test_detect_cjk_language_long_text_with_lone_surrogate(text, expected):
+    assert len(text) >= lang_detect._CJK_VECTORIZE_MIN_CHARS
+    assert detect_cjk_language(text) == expected
+
+
+# Codepoints on either side of each counted block, plus 4-byte characters
+EDGE_CODEPOINTS = [
+    0xABFF, 0xAC00, 0xD7A3, 0xD7A4,          # Hangul syllables
+    0x303F, 0x3040, 0x309F, 0x30A0, 0x30FF, 0x3100,  # Hiragana + Katakana
+    0x4DFF, 0x4E00, 0x9FFF, 0xA000,          # CJK Unified Ideographs
+    0x1F600, 0x20000, 0x10FFFF,              # 4-byte UTF-8
+]
+
+COUNTER_TEXTS = {
+    'empty': '',
+    'whitespace-only': ' \t\n\r\x0b\x0c ',
+    'ascii': 'Hello, world!',
+    'edges': ''.join(chr(cp) for cp in EDGE_CODEPOINTS),
+    'edges-spaced': ' '.join(chr(cp) for cp in EDGE_CODEPOINTS),
+    'mixed': '안녕하세요 こんにちは カタカナ 中文 hello \U0001F600 \U00020000',
+    'lone-surrogate': '한국어' + LONE_SURROGATE + ' text',
+    'long-korean': '안녕하세요 반갑습니다 ' * 100,
+    'long-mixed': ('English words 日本語 한국어 中文 ' * 60),
+}
+
+# Every codepoint, including surrogates; short enough to count in well under a second
+ALL_CODEPOINTS = ''.join(map(chr, range(0x110000)))
+
+needs_numpy = pytest.mark.skipif(lang_detect.np is None, reason='NumPy is not installed')
+
+
+def _numba_kernel(getter):
+    """Compiled kernel from a lang_detect getter; skips the test without numba."""
+    pytest.importorskip('numba')
+    return getter()
+
+
+def _count_scripts_reference(text):
+    """Counts from the plain per-character loop, which the other counters must match."""
+    return lang_detect._count_scripts_python(text)
+
+
+def _ko_ratio_reference(text):
+    korean_chars, _, _, total_chars = _count_scripts_reference(text)
+    return korean_chars / total_chars if total_chars else 0.0
+
+
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_count_scripts_utf8_matches_python(text):
+    assert lang_detect._count_scripts_utf8(text) == _count_scripts_reference(text)
+
+
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_ko_ratio_utf8_matches_python(text):
+    assert lang_detect._ko_ratio_utf8(text) == _ko_ratio_reference(text)
+
+
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_utf8_helpers_match_python(text):
+    data = text.encode('utf-8', 'surrogatepass')
+    korean_chars, _, _, total_chars = _count_scripts_reference(text)
+    assert lang_detect._count_hangul_utf8(data) == korean_chars
+    assert lang_detect._count_nonspace_utf8(text, data) == total_chars
+
+
+@needs_numpy
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_numpy_counters_match_python(text):
+    codepoints = lang_detect._to_codepoints(text)
+    assert lang_detect._count_scripts_numpy(codepoints) == _count_scripts_reference(text)
+    assert lang_detect._ko_ratio_numpy(codepoints) == _ko_ratio_reference(text)
+
+
+def test_counters_match_python_on_every_codepoint():
+    expected = _count_scripts_reference(ALL_CODEPOINTS)
+    assert lang_detect._count_scripts_utf8(ALL_CODEPOINTS) == expected
+    if lang_detect.np is not None:
+        assert lang_detect._count_scripts_numpy(lang_detect._to_codepoints(ALL_CODEPOINTS)) == expected
+
+
+def _check_loop_kernels(count_scripts, ko_ratio, text):
+    """
+    The loop kernels may stop early once the Korean count decides the answer,
+    so compare exact counts when they cannot have stopped, decisions otherwise.
+    """
+    codepoints = lang_detect._to_codepoints(text)
+    expected_counts = _count_scripts_reference(text)
+    expected_ratio = _ko_ratio_reference(text)
+    if len(text) <= lang_detect._EARLY_EXIT_STRIDE:
+        assert count_scripts(codepoints) == expected_counts
+        assert ko_ratio(codepoints) == expected_ratio
+        return
+
+    korean_chars, _, _, total_chars = count_scripts(codepoints)
+    expected_korean, _, _, expected_total = expected_counts
+    cjk_ratio = korean_chars / total_chars if total_chars else 0.0
+    expected_cjk_ratio = expected_korean / expected_total if expected_total else 0.0
+    assert (cjk_ratio > lang_detect._CJK_THRESHOLD) == (expected_cjk_ratio > lang_detect._CJK_THRESHOLD)
+    if cjk_ratio <= lang_detect._CJK_THRESHOLD:
+        # Not decided as Korean, so the loop ran to the end
+        assert (korean_chars, total_chars) == (expected_korean, expected_total)
+    assert (ko_ratio(codepoints) > lang_detect._KO_THRESHOLD) == (expected_ratio > lang_detect._KO_THRESHOLD)
+
+
+@needs_numpy
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_loop_kernels_match_python(text):
+    # Uncompiled: the same code numba compiles
+    _check_loop_kernels(lang_detect._count_scripts_loop, lang_detect._ko_ratio_loop, text)
+
+
+@needs_numpy
+@pytest.mark.parametrize('text', COUNTER_TEXTS.values(), ids=COUNTER_TEXTS.keys())
+def test_numba_kernels_match_python(text):
+    count_scripts = _numba_kernel(lang_detect._get_count_scripts)
+    ko_ratio = _numba_kernel(lang_detect._get_ko_ratio)
+    _check_loop_kernels(count_scripts, ko_ratio, text)